@@ -0,0 +1,242 @@
+"""Download HLTV demo archives on a single asyncio event loop."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import cloudscraper
+from cloudscraper.exceptions import CloudflareException
+from requests.exceptions import RequestException
+from tqdm import tqdm
+
+from .cookies import load_cookies, save_cookies
+from .downloader import DEMO_URL_TEMPLATE, DownloadResult, filename_from_response
+from .metadata import MetadataCollector
+
+try:  # pragma: no cover - optional dependency
+    import aiofiles
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiofiles = None
+    aiohttp = None
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHALLENGE_URL = "https://www.hltv.org/"
+
+
+class CloudflareChallengeError(Exception):
+    """Raised when Cloudflare challenges a request made outside cloudscraper."""
+
+
+class AsyncDemoDownloader:
+    """Download demos concurrently with ``aiohttp``, bounded by a semaphore.
+
+    Cloudflare challenges are solved once by ``cloudscraper`` in a worker thread;
+    the resulting cookies and User-Agent are then reused by the ``aiohttp`` session.
+    Await :meth:`aclose` (or use ``async with``) when done; collected metadata is
+    only written to the metadata file at that point.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        *,
+        chunk_size: int = 1024 * 1024,
+        retries: int = 3,
+        timeout: int = 60,
+        skip_existing: bool = True,
+        metadata_path: Optional[Path] = None,
+        cookie_cache: Optional[Path] = None,
+        max_workers: int = 16,
+    ) -> None:
+        if aiohttp is None or aiofiles is None:
+            raise RuntimeError(
+                "Async downloads require aiohttp and aiofiles; install them with 'pip install aiohttp aiofiles'."
+            )
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.retries = max(1, retries)
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.skip_existing = skip_existing
+        self.scraper = cloudscraper.create_scraper()
+        self.cookie_cache = Path(cookie_cache) if cookie_cache else None
+        if self.cookie_cache:
+            load_cookies(self.scraper, self.cookie_cache)
+        self.metadata_collector = (
+            MetadataCollector(self.scraper, metadata_path, timeout=timeout)
+            if metadata_path
+            else None
+        )
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._challenge_lock: Optional[asyncio.Lock] = None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    async def aclose(self) -> None:
+        """Flush collected metadata and close the HTTP session."""
+
+        try:
+            if self.cookie_cache:
+                save_cookies(self.scraper, self.cookie_cache)
+            if self.metadata_collector:
+                await asyncio.to_thread(self.metadata_collector.finalize)
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+    async def __aenter__(self) -> "AsyncDemoDownloader":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def download_many(self, demo_ids: Iterable[int]) -> List[DownloadResult]:
+        demo_ids = list(demo_ids)
+        results: List[Optional[DownloadResult]] = [None] * len(demo_ids)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(index: int, demo_id: int) -> Tuple[int, DownloadResult]:
+            async with semaphore:
+                result = await self.download_demo(demo_id, position=index % self.max_workers)
+            return index, result
+
+        await self._get_session()
+        for next_result in asyncio.as_completed(
+            [run(index, demo_id) for index, demo_id in enumerate(demo_ids)]
+        ):
+            index, result = await next_result
+            results[index] = result
+        return [result for result in results if result is not None]
+
+    async def download_demo(self, demo_id: int, *, position: Optional[int] = None) -> DownloadResult:
+        session = await self._get_session()
+        url = DEMO_URL_TEMPLATE.format(demo_id=demo_id)
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                _LOGGER.debug("Fetching demo %s (attempt %s)", demo_id, attempt)
+                async with session.get(url) as response:
+                    if response.status == 404:
+                        return DownloadResult(demo_id, "not_found", "Demo ID does not exist")
+                    if self._is_challenge(response):
+                        await self._solve_challenge()
+                        raise CloudflareChallengeError(f"Cloudflare challenge for {url}")
+                    response.raise_for_status()
+
+                    filename = filename_from_response(response, demo_id)
+                    destination = self.output_dir / filename
+                    if self.skip_existing and destination.exists():
+                        _LOGGER.info("Skipping %s; file already exists", filename)
+                        return DownloadResult(
+                            demo_id,
+                            "skipped",
+                            "File already exists",
+                            destination,
+                        )
+
+                    progress = tqdm(
+                        total=response.content_length,
+                        unit="B",
+                        unit_scale=True,
+                        desc=f"Demo {demo_id}",
+                        leave=False,
+                        position=position,
+                    )
+                    bytes_written = 0
+                    try:
+                        async with aiofiles.open(destination, "wb") as file_handle:
+                            async for chunk in response.content.iter_chunked(self.chunk_size):
+                                await file_handle.write(chunk)
+                                bytes_written += len(chunk)
+                                progress.update(len(chunk))
+                    except BaseException:
+                        # A partial file would be skipped as complete on the next attempt.
+                        destination.unlink(missing_ok=True)
+                        raise
+                    finally:
+                        progress.close()
+                    resolved_url = str(response.url)
+
+                _LOGGER.info("Downloaded %s -> %s", url, destination)
+                if self.metadata_collector:
+                    try:
+                        await asyncio.to_thread(
+                            self.metadata_collector.record_download,
+                            demo_id,
+                            file_path=destination,
+                            original_url=url,
+                            resolved_url=resolved_url,
+                        )
+                    except Exception as exc:  # pragma: no cover - defensive logging
+                        _LOGGER.warning(
+                            "Failed to record metadata for demo %s: %s", demo_id, exc
+                        )
+                return DownloadResult(
+                    demo_id,
+                    "downloaded",
+                    file_path=destination,
+                    bytes_downloaded=bytes_written,
+                )
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                CloudflareChallengeError,
+                CloudflareException,
+                RequestException,
+            ) as exc:
+                last_error = exc
+                _LOGGER.warning(
+                    "Error downloading demo %s on attempt %s/%s: %s",
+                    demo_id,
+                    attempt,
+                    self.retries,
+                    exc,
+                )
+        error_message = f"Failed after {self.retries} attempts: {last_error}"
+        _LOGGER.error("%s", error_message)
+        return DownloadResult(demo_id, "failed", error_message)
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=self.max_workers,
+                keepalive_timeout=85,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout),
+            )
+            self._challenge_lock = asyncio.Lock()
+            try:
+                await self._solve_challenge()
+            except (CloudflareException, RequestException) as exc:
+                # Downloads retry the challenge themselves if it is still required.
+                _LOGGER.warning("Unable to pre-solve Cloudflare challenge: %s", exc)
+        return self._session
+
+    async def _solve_challenge(self) -> None:
+        """Let cloudscraper pass the Cloudflare challenge and copy its clearance to aiohttp."""
+
+        assert self._session is not None and self._challenge_lock is not None
+        async with self._challenge_lock:
+            await asyncio.to_thread(self.scraper.get, _CHALLENGE_URL, timeout=self.timeout)
+            cookies = SimpleCookie()
+            for cookie in self.scraper.cookies:
+                cookies[cookie.name] = cookie.value or ""
+                cookies[cookie.name]["domain"] = cookie.domain
+                cookies[cookie.name]["path"] = cookie.path
+            self._session.cookie_jar.update_cookies(cookies)
+            # Cloudflare ties clearance cookies to the User-Agent that solved the challenge.
+            self._session.headers["User-Agent"] = self.scraper.headers["User-Agent"]
+
+    @staticmethod
+    def _is_challenge(response: "aiohttp.ClientResponse") -> bool:
+        if response.status not in {403, 429, 503}:
+            return False
+        return response.headers.get("Server", "").lower().startswith("cloudflare")
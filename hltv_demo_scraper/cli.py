@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import sys
 from datetime import timedelta
@@ -9,6 +10,7 @@ from pathlib import Path
 from time import perf_counter
 from typing import Iterable, List
 
+from .async_downloader import AsyncDemoDownloader
 from .downloader import DemoDownloader, DownloadResult, unique_demo_ids, write_demo_id_file
 
 DEFAULT_OUTPUT_DIR = Path("demos")
@@ -62,8 +64,8 @@ def build_parser() -> argparse.ArgumentParser:
     download_parser.add_argument(
         "--chunk-size",
         type=int,
-        default=64 * 1024,
-        help="Chunk size (in bytes) for streaming downloads. Default: 65536.",
+        default=1024 * 1024,
+        help="Buffer size (in bytes) for copying streamed downloads to disk. Default: 1048576.",
     )
     download_parser.add_argument(
         "--retries",
@@ -77,11 +79,38 @@ def build_parser() -> argparse.ArgumentParser:
         default=60,
         help="Request timeout in seconds for each download attempt. Default: 60.",
     )
+    download_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of demos to download in parallel. Keep this low to avoid HLTV rate limits. Default: 4.",
+    )
+    download_parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Multiplex demo and metadata requests over HTTP/2 (requires httpx[http2]).",
+    )
+    download_parser.add_argument(
+        "--io-uring",
+        action="store_true",
+        help="Write demos to disk with batched io_uring submissions (Linux only, requires liburing).",
+    )
+    download_parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Download on a single asyncio event loop with aiohttp (requires aiohttp and aiofiles).",
+    )
     download_parser.add_argument(
         "--overwrite",
         action="store_true",
         help="Overwrite files if they already exist.",
     )
+    download_parser.add_argument(
+        "--cookie-cache",
+        type=Path,
+        help="Path to a file used to reuse Cloudflare clearance cookies across runs.",
+    )
     download_parser.add_argument(
         "--metadata-file",
         type=Path,
@@ -123,16 +152,36 @@ def main(argv: List[str] | None = None) -> int:
 
         metadata_path = args.metadata_file or (args.output_dir / "metadata.json")
 
-        downloader = DemoDownloader(
-            args.output_dir,
+        if args.use_async and (args.http2 or args.io_uring):
+            parser.error("--async cannot be combined with --http2 or --io-uring.")
+
+        common_options = dict(
             chunk_size=args.chunk_size,
             retries=args.retries,
             timeout=args.timeout,
             skip_existing=not args.overwrite,
             metadata_path=metadata_path,
+            cookie_cache=args.cookie_cache,
+            max_workers=args.concurrency,
         )
+        try:
+            if args.use_async:
+                async_downloader = AsyncDemoDownloader(args.output_dir, **common_options)
+            else:
+                downloader = DemoDownloader(
+                    args.output_dir,
+                    http2=args.http2,
+                    use_io_uring=args.io_uring,
+                    **common_options,
+                )
+        except RuntimeError as exc:
+            parser.error(str(exc))
         start_time = perf_counter()
-        results = downloader.download_many(demo_ids)
+        if args.use_async:
+            results = asyncio.run(_download_async(async_downloader, demo_ids))
+        else:
+            with downloader:
+                results = downloader.download_many(demo_ids)
         elapsed_seconds = perf_counter() - start_time
         _print_summary(results, elapsed_seconds)
         failed_downloads = [result for result in results if result.status not in {"downloaded", "skipped"}]
@@ -142,6 +191,11 @@ def main(argv: List[str] | None = None) -> int:
     return 2
 
 
+async def _download_async(downloader: AsyncDemoDownloader, demo_ids: List[int]) -> List[DownloadResult]:
+    async with downloader:
+        return await downloader.download_many(demo_ids)
+
+
 def _collect_demo_ids(args: argparse.Namespace) -> List[int]:
     ids: List[int] = []
     if args.ids:
@@ -160,17 +214,25 @@ def _collect_demo_ids(args: argparse.Namespace) -> List[int]:
 def _load_ids_from_files(files: Iterable[Path]) -> List[int]:
     demo_ids: List[int] = []
     for file_path in files:
-        with Path(file_path).open("r", encoding="utf-8") as handle:
-            for line_number, line in enumerate(handle, start=1):
+        lines = Path(file_path).read_text(encoding="utf-8").splitlines()
+        try:
+            # int() ignores surrounding whitespace, so only blank and comment lines need filtering.
+            demo_ids.extend(
+                [int(line) for line in lines if line.strip() and not line.lstrip().startswith("#")]
+            )
+        except ValueError:
+            # Re-scan line by line to report where the invalid ID is.
+            for line_number, line in enumerate(lines, start=1):
                 stripped = line.strip()
                 if not stripped or stripped.startswith("#"):
                     continue
                 try:
-                    demo_ids.append(int(stripped))
+                    int(stripped)
                 except ValueError as exc:
                     raise SystemExit(
                         f"Invalid demo ID '{stripped}' in {file_path} on line {line_number}: {exc}"
                     ) from exc
+            raise
     return demo_ids
 
 
@@ -210,12 +272,9 @@ def _format_bytes(num_bytes: int) -> str:
     if num_bytes <= 0:
         return "0 B"
     units = ["B", "KB", "MB", "GB", "TB", "PB"]
-    size = float(num_bytes)
-    for unit in units:
-        if size < 1024 or unit == units[-1]:
-            return f"{size:.2f} {unit}"
-        size /= 1024
-    return f"{size:.2f} PB"
+    # Each unit spans 10 bits, so the bit length selects the unit directly.
+    index = min(len(units) - 1, (int(num_bytes).bit_length() - 1) // 10)
+    return f"{num_bytes / (1 << (index * 10)):.2f} {units[index]}"
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
@@ -0,0 +1,65 @@
+"""Persist Cloudflare clearance cookies between runs."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from cloudscraper import CloudScraper
+from requests.cookies import create_cookie
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_cookies(scraper: CloudScraper, cache_path: Path) -> None:
+    """Restore cookies and the User-Agent saved by :func:`save_cookies`, if present."""
+
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        return
+    try:
+        with cache_path.open("r", encoding="utf-8") as handle:
+            cached = json.load(handle)
+        now = time.time()
+        for cookie in cached["cookies"]:
+            if cookie.get("expires") is not None and cookie["expires"] <= now:
+                continue
+            scraper.cookies.set_cookie(create_cookie(**cookie))
+        # Cloudflare ties clearance cookies to the User-Agent that solved the challenge.
+        if cached.get("user_agent"):
+            scraper.headers["User-Agent"] = cached["user_agent"]
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        _LOGGER.warning("Ignoring unreadable cookie cache at %s: %s", cache_path, exc)
+        return
+    _LOGGER.debug("Loaded cached cookies from %s", cache_path)
+
+
+def save_cookies(scraper: CloudScraper, cache_path: Path) -> None:
+    """Write the scraper's cookies and User-Agent to ``cache_path``."""
+
+    cache_path = Path(cache_path)
+    scraper.cookies.clear_expired_cookies()
+    cached = {
+        "user_agent": scraper.headers.get("User-Agent"),
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in scraper.cookies
+        ],
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # The cache holds session credentials, so keep it private to the current user.
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(cached, handle, indent=2)
+    except OSError as exc:
+        _LOGGER.warning("Unable to write cookie cache at %s: %s", cache_path, exc)
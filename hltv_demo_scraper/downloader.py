@@ -1,23 +1,44 @@
 """Download HLTV demo archives with progress reporting."""
 from __future__ import annotations
 
+import io
 import logging
+import os
+import re
+import select
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
-from urllib.parse import unquote
+from typing import BinaryIO, Iterable, List, Optional
+from urllib.parse import unquote, urlsplit
 
 import cloudscraper
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.exceptions import ProtocolError
 
+from .cookies import load_cookies, save_cookies
+from .http2 import Http2Session
 from .metadata import MetadataCollector
+from .uring import IoUringBatchEngine, UringFileWriter
 
 _LOGGER = logging.getLogger(__name__)
 
 DEMO_URL_TEMPLATE = "https://www.hltv.org/download/demo/{demo_id}"
 
+# Number of IDs formatted per write when generating ID files.
+_ID_FILE_BATCH_SIZE = 65536
+
+# Matches ``filename`` and ``filename*`` parameters; quoted values may contain ``;``.
+_CONTENT_DISPOSITION_RE = re.compile(
+    r'(?:^|;)\s*(filename\*?)\s*=\s*("[^"]*"|[^;]*)', re.IGNORECASE
+)
+
 
 @dataclass
 class DownloadResult:
@@ -34,50 +55,122 @@ class DownloadResult:
 
 
 class DemoDownloader:
-    """Download demos from HLTV with Cloudscraper and a progress bar."""
+    """Download demos from HLTV with Cloudscraper and a progress bar.
+
+    Call :meth:`close` (or use the downloader as a context manager) when done;
+    collected metadata is only written to the metadata file at that point.
+    """
 
     def __init__(
         self,
         output_dir: Path,
         *,
-        chunk_size: int = 64 * 1024,
+        chunk_size: int = 1024 * 1024,
         retries: int = 3,
         timeout: int = 60,
         skip_existing: bool = True,
         metadata_path: Optional[Path] = None,
+        cookie_cache: Optional[Path] = None,
+        max_workers: int = 4,
+        http2: bool = False,
+        use_io_uring: bool = False,
     ) -> None:
         self.output_dir = Path(output_dir)
         self.chunk_size = chunk_size
         self.retries = max(1, retries)
+        self.max_workers = max(1, max_workers)
         self.timeout = timeout
         self.skip_existing = skip_existing
+        self.uring_engine = IoUringBatchEngine() if use_io_uring else None
         self.scraper = cloudscraper.create_scraper()
+        self.cookie_cache = Path(cookie_cache) if cookie_cache else None
+        if self.cookie_cache:
+            load_cookies(self.scraper, self.cookie_cache)
+        self._configure_connection_pool()
+        self.session = (
+            Http2Session(self.scraper, max_connections=self.max_workers) if http2 else self.scraper
+        )
         self.metadata_collector = (
-            MetadataCollector(self.scraper, metadata_path, timeout=timeout)
+            MetadataCollector(self.session, metadata_path, timeout=timeout)
             if metadata_path
             else None
         )
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def close(self) -> None:
+        """Flush collected metadata and release the HTTP/2 client and io_uring engine."""
+
+        try:
+            if self.cookie_cache:
+                save_cookies(self.scraper, self.cookie_cache)
+            if self.metadata_collector:
+                self.metadata_collector.finalize()
+        finally:
+            try:
+                if self.uring_engine is not None:
+                    self.uring_engine.close()
+                    self.uring_engine = None
+            finally:
+                if isinstance(self.session, Http2Session):
+                    self.session.close()
+
+    def __enter__(self) -> "DemoDownloader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _configure_connection_pool(self) -> None:
+        """Size the keep-alive pool so every worker and metadata fetch reuses a connection."""
+
+        # Cloudscraper mounts its own TLS-fingerprinting adapter on https://; mounting a plain
+        # HTTPAdapter would undo that, so resize the existing adapter's pool manager instead.
+        adapter = self.scraper.get_adapter("https://")
+        if isinstance(adapter, HTTPAdapter):
+            adapter._pool_connections = self.max_workers
+            adapter._pool_maxsize = self.max_workers * 2
+            adapter._pool_block = False
+            adapter.init_poolmanager(self.max_workers, self.max_workers * 2, block=False)
+        self.scraper.headers.update({"Connection": "keep-alive"})
+
     def download_many(self, demo_ids: Iterable[int]) -> List[DownloadResult]:
-        results: List[DownloadResult] = []
-        for demo_id in demo_ids:
-            result = self.download_demo(demo_id)
-            results.append(result)
-        return results
+        demo_ids = list(demo_ids)
+        results: List[Optional[DownloadResult]] = [None] * len(demo_ids)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(
+                    self.download_demo, demo_id, position=index % self.max_workers
+                ): index
+                for index, demo_id in enumerate(demo_ids)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as exc:
+                    error_message = f"Unexpected error: {exc}"
+                    _LOGGER.error("Error downloading demo %s: %s", demo_ids[index], exc)
+                    results[index] = DownloadResult(demo_ids[index], "failed", error_message)
+        except BaseException:
+            # Drop queued downloads so Ctrl-C does not wait for the rest of the range.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return [result for result in results if result is not None]
 
-    def download_demo(self, demo_id: int) -> DownloadResult:
+    def download_demo(self, demo_id: int, *, position: Optional[int] = None) -> DownloadResult:
         url = DEMO_URL_TEMPLATE.format(demo_id=demo_id)
         last_error: Optional[Exception] = None
         for attempt in range(1, self.retries + 1):
             try:
                 _LOGGER.debug("Fetching demo %s (attempt %s)", demo_id, attempt)
-                with self.scraper.get(url, timeout=self.timeout, stream=True) as response:
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
                     if response.status_code == 404:
                         return DownloadResult(demo_id, "not_found", "Demo ID does not exist")
                     response.raise_for_status()
 
-                    filename = self._filename_from_response(response, demo_id)
+                    filename = filename_from_response(response, demo_id)
                     destination = self.output_dir / filename
                     if self.skip_existing and destination.exists():
                         _LOGGER.info("Skipping %s; file already exists", filename)
@@ -95,17 +188,12 @@ class DemoDownloader:
                         unit_scale=True,
                         desc=f"Demo {demo_id}",
                         leave=False,
+                        position=position,
                     )
-                    bytes_written = 0
                     try:
-                        with destination.open("wb") as file_handle:
-                            for chunk in response.iter_content(chunk_size=self.chunk_size):
-                                if not chunk:
-                                    continue
-                                file_handle.write(chunk)
-                                chunk_length = len(chunk)
-                                bytes_written += chunk_length
-                                progress.update(chunk_length)
+                        bytes_written = self._stream_body(
+                            response, destination, progress, total_bytes
+                        )
                     finally:
                         progress.close()
 
@@ -116,7 +204,7 @@ class DemoDownloader:
                             demo_id,
                             file_path=destination,
                             original_url=url,
-                            response=response,
+                            resolved_url=response.url,
                         )
                     except Exception as exc:  # pragma: no cover - defensive logging
                         _LOGGER.warning(
@@ -128,7 +216,7 @@ class DemoDownloader:
                     file_path=destination,
                     bytes_downloaded=bytes_written,
                 )
-            except RequestException as exc:
+            except (RequestException, Urllib3HTTPError) as exc:
                 last_error = exc
                 _LOGGER.warning(
                     "Error downloading demo %s on attempt %s/%s: %s",
@@ -141,6 +229,113 @@ class DemoDownloader:
         _LOGGER.error("%s", error_message)
         return DownloadResult(demo_id, "failed", error_message)
 
+    def _stream_body(
+        self,
+        response: Response,
+        destination: Path,
+        progress: tqdm,
+        total_bytes: Optional[int],
+    ) -> int:
+        """Write the response body to ``destination`` and return the number of bytes written."""
+
+        try:
+            with destination.open("wb") as file_handle:
+                self._preallocate(file_handle, total_bytes)
+                if self._splice_body(response, file_handle, progress, total_bytes):
+                    bytes_written = file_handle.tell()
+                else:
+                    response.raw.decode_content = True
+                    body = CallbackIOWrapper(progress.update, response.raw, "read")
+                    if self.uring_engine is not None:
+                        with UringFileWriter(self.uring_engine, file_handle.fileno()) as writer:
+                            shutil.copyfileobj(body, writer, length=self.chunk_size)
+                        bytes_written = writer.offset
+                    else:
+                        shutil.copyfileobj(body, file_handle, length=self.chunk_size)
+                        bytes_written = file_handle.tell()
+                # Content-Length counts encoded bytes, so trim any unused preallocated tail.
+                file_handle.truncate(bytes_written)
+                return bytes_written
+        except BaseException:
+            # A partial (and possibly zero-padded) file would be skipped as complete later on.
+            destination.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _preallocate(file_handle: BinaryIO, total_bytes: Optional[int]) -> None:
+        """Reserve contiguous space for the demo up front where the platform allows it."""
+
+        if not total_bytes or not hasattr(os, "posix_fallocate"):
+            return
+        try:
+            os.posix_fallocate(file_handle.fileno(), 0, total_bytes)
+        except OSError as exc:
+            # tmpfs, CoW filesystems and some network mounts do not support preallocation.
+            _LOGGER.debug("Unable to preallocate %s bytes: %s", total_bytes, exc)
+
+    def _splice_body(
+        self,
+        response: Response,
+        file_handle: BinaryIO,
+        progress: tqdm,
+        total_bytes: Optional[int],
+    ) -> bool:
+        """Move a plain HTTP body from the socket to disk without copying through userspace.
+
+        Only identity-encoded, fixed-length bodies served over plain HTTP qualify; TLS
+        (including every Cloudflare-fronted HLTV URL) always takes the regular copy path.
+        Returns ``False`` without consuming any data when the response is not eligible.
+        """
+
+        if not hasattr(os, "splice") or not total_bytes:
+            return False
+        if urlsplit(response.url).scheme != "http":
+            return False
+        if response.headers.get("Content-Encoding") or response.headers.get("Transfer-Encoding"):
+            return False
+        socket_reader = getattr(getattr(response.raw, "_fp", None), "fp", None)
+        if not isinstance(socket_reader, io.BufferedReader):
+            return False
+
+        try:
+            # Part of the body may already sit in the reader's buffer after the headers.
+            buffered = socket_reader.peek(1)[:total_bytes]
+            socket_reader.read(len(buffered))
+            file_handle.write(buffered)
+            file_handle.flush()
+            progress.update(len(buffered))
+
+            socket_fd = socket_reader.fileno()
+            file_fd = file_handle.fileno()
+            remaining = total_bytes - len(buffered)
+            # poll() rather than select(): select() rejects descriptors >= FD_SETSIZE.
+            poller = select.poll()
+            poller.register(socket_fd, select.POLLIN)
+            pipe_read, pipe_write = os.pipe()
+            try:
+                while remaining:
+                    try:
+                        moved = os.splice(socket_fd, pipe_write, min(remaining, self.chunk_size))
+                    except BlockingIOError:
+                        # Sockets with a timeout are non-blocking at the OS level.
+                        if not poller.poll(self.timeout * 1000):
+                            raise ProtocolError("Timed out while reading demo body")
+                        continue
+                    if moved == 0:
+                        raise ProtocolError("Connection closed before the demo body was complete")
+                    pending = moved
+                    while pending:
+                        pending -= os.splice(pipe_read, file_fd, pending)
+                    remaining -= moved
+                    progress.update(moved)
+            finally:
+                os.close(pipe_read)
+                os.close(pipe_write)
+        except OSError as exc:
+            raise ProtocolError(f"Zero-copy transfer failed: {exc}") from exc
+        file_handle.seek(total_bytes)
+        return True
+
     @staticmethod
     def _content_length(response: Response) -> Optional[int]:
         header_value = response.headers.get("Content-Length")
@@ -151,58 +346,48 @@ class DemoDownloader:
         except ValueError:
             return None
 
-    @staticmethod
-    def _filename_from_response(response: Response, demo_id: int) -> str:
-        disposition = response.headers.get("Content-Disposition")
-        if disposition:
-            filename = DemoDownloader._parse_content_disposition(disposition)
-            if filename:
-                return DemoDownloader._ensure_demo_id_prefix(filename, demo_id)
-
-        # Fall back to deriving from the final URL if present.
-        filename = Path(response.url).name.split("?")[0]
+
+def filename_from_response(response: Response, demo_id: int) -> str:
+    disposition = response.headers.get("Content-Disposition")
+    if disposition:
+        filename = parse_content_disposition(disposition)
         if filename:
-            return DemoDownloader._ensure_demo_id_prefix(filename, demo_id)
+            return ensure_demo_id_prefix(filename, demo_id)
 
-        return f"{demo_id}_demo.rar"
+    # Fall back to deriving from the final URL if present.
+    filename = urlsplit(str(response.url)).path.rsplit("/", 1)[-1]
+    if filename:
+        return ensure_demo_id_prefix(filename, demo_id)
 
-    @staticmethod
-    def _ensure_demo_id_prefix(filename: str, demo_id: int) -> str:
-        sanitized = Path(filename).name
-        prefix = f"{demo_id}_"
-        if sanitized.startswith(prefix):
-            return sanitized
-        return prefix + sanitized
+    return f"{demo_id}_demo.rar"
 
-    @staticmethod
-    def _parse_content_disposition(header_value: str) -> Optional[str]:
-        parts = [part.strip() for part in header_value.split(";") if part.strip()]
-        for part in parts[1:]:
-            if "=" not in part:
-                continue
-            key, value = part.split("=", 1)
-            key = key.lower().strip()
-            value = value.strip().strip('"')
-
-            if key == "filename*":
-                # RFC 5987: filename*=UTF-8''encoded-name
-                _, _, encoded_value = value.partition("''")
-                candidate = encoded_value or value
-                return Path(unquote(candidate)).name
-            if key == "filename":
-                return Path(value).name
-        return None
+
+def ensure_demo_id_prefix(filename: str, demo_id: int) -> str:
+    sanitized = Path(filename).name
+    prefix = f"{demo_id}_"
+    if sanitized.startswith(prefix):
+        return sanitized
+    return prefix + sanitized
+
+
+def parse_content_disposition(header_value: str) -> Optional[str]:
+    filename: Optional[str] = None
+    for match in _CONTENT_DISPOSITION_RE.finditer(header_value):
+        key = match.group(1).lower()
+        value = match.group(2).strip().strip('"')
+        if key == "filename*":
+            # RFC 5987: filename*=UTF-8''encoded-name
+            _, _, encoded_value = value.partition("''")
+            candidate = encoded_value or value
+            return Path(unquote(candidate)).name
+        if filename is None:
+            filename = Path(value).name
+    return filename
 
 
 def unique_demo_ids(demo_ids: Iterable[int]) -> List[int]:
-    seen = set()
-    ordered_ids: List[int] = []
-    for demo_id in demo_ids:
-        if demo_id in seen:
-            continue
-        seen.add(demo_id)
-        ordered_ids.append(demo_id)
-    return ordered_ids
+    # dict preserves insertion order, so this dedupes while keeping first occurrences.
+    return list(dict.fromkeys(demo_ids))
 
 
 def write_demo_id_file(start_id: int, end_id: int, destination: Path) -> Path:
@@ -211,8 +396,9 @@ def write_demo_id_file(start_id: int, end_id: int, destination: Path) -> Path:
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     with destination.open("w", encoding="utf-8") as handle:
-        for demo_id in range(start_id, end_id + 1):
-            handle.write(f"{demo_id}\n")
+        for batch_start in range(start_id, end_id + 1, _ID_FILE_BATCH_SIZE):
+            batch_end = min(batch_start + _ID_FILE_BATCH_SIZE, end_id + 1)
+            handle.write("\n".join(map(str, range(batch_start, batch_end))) + "\n")
     _LOGGER.info(
         "Wrote %s demo IDs (%s-%s) to %s",
         end_id - start_id + 1,
@@ -0,0 +1,152 @@
+"""Optional HTTP/2 transport built on ``httpx`` for multiplexing HLTV requests."""
+from __future__ import annotations
+
+import io
+import logging
+from typing import Iterator, Optional
+
+from cloudscraper import CloudScraper
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
+
+try:  # pragma: no cover - optional dependency
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+_LOGGER = logging.getLogger(__name__)
+
+_INSTALL_HINT = "HTTP/2 support requires httpx with h2; install it with 'pip install httpx[http2]'."
+
+# Hop-by-hop headers are forbidden on HTTP/2 connections.
+_CONNECTION_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+class _ByteStreamReader(io.RawIOBase):
+    """File-like view over a streamed body, standing in for ``requests``' ``response.raw``."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._pending = b""
+        # Accepted for API compatibility; httpx always yields decoded bytes.
+        self.decode_content = True
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class Http2Response:
+    """Expose the subset of the ``requests.Response`` API used by the scraper."""
+
+    def __init__(self, response: "httpx.Response") -> None:
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self._raw: Optional[_ByteStreamReader] = None
+
+    @property
+    def raw(self) -> _ByteStreamReader:
+        if self._raw is None:
+            self._raw = _ByteStreamReader(self.iter_content())
+        return self._raw
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_bytes(chunk_size=chunk_size)
+        except httpx.TimeoutException as exc:
+            raise Timeout(exc) from exc
+        except httpx.HTTPError as exc:
+            raise RequestsConnectionError(exc) from exc
+
+    def close(self) -> None:
+        self._response.close()
+
+    def __enter__(self) -> "Http2Response":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class Http2Session:
+    """Route GET requests over a shared HTTP/2 connection pool.
+
+    Cloudflare challenges are still solved by ``cloudscraper``: when a request is
+    challenged it is replayed through the scraper and the resulting clearance
+    cookies are copied into the HTTP/2 client for subsequent requests.
+    """
+
+    def __init__(self, scraper: CloudScraper, *, max_connections: int = 4) -> None:
+        if httpx is None:
+            raise RuntimeError(_INSTALL_HINT)
+        self.scraper = scraper
+        headers = {
+            key: value
+            for key, value in scraper.headers.items()
+            if key.lower() not in _CONNECTION_HEADERS
+        }
+        try:
+            self.client = httpx.Client(
+                http2=True,
+                headers=headers,
+                limits=httpx.Limits(max_keepalive_connections=max_connections),
+                follow_redirects=True,
+            )
+        except ImportError as exc:
+            # httpx is installed without the h2 extra.
+            raise RuntimeError(_INSTALL_HINT) from exc
+        self._sync_cookies()
+
+    def get(self, url: str, *, timeout: Optional[float] = None, stream: bool = False):
+        try:
+            request = self.client.build_request("GET", url, timeout=timeout)
+            response = self.client.send(request, stream=stream)
+        except httpx.TimeoutException as exc:
+            raise Timeout(exc) from exc
+        except httpx.HTTPError as exc:
+            raise RequestsConnectionError(exc) from exc
+
+        if self._is_challenge(response):
+            response.close()
+            _LOGGER.debug("Cloudflare challenge for %s; solving with cloudscraper", url)
+            fallback = self.scraper.get(url, timeout=timeout, stream=stream)
+            self._sync_cookies()
+            return fallback
+        return Http2Response(response)
+
+    def close(self) -> None:
+        self.client.close()
+
+    @staticmethod
+    def _is_challenge(response: "httpx.Response") -> bool:
+        if response.status_code not in {403, 429, 503}:
+            return False
+        return response.headers.get("Server", "").lower().startswith("cloudflare")
+
+    def _sync_cookies(self) -> None:
+        for cookie in self.scraper.cookies:
+            self.client.cookies.set(
+                cookie.name, cookie.value or "", domain=cookie.domain, path=cookie.path
+            )
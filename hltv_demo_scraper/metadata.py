@@ -3,21 +3,36 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Union
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
 from cloudscraper import CloudScraper
-from requests import Response
 from requests.exceptions import RequestException
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from .http2 import Http2Session
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
 
 _BASE_URL = "https://www.hltv.org"
 
+_RESULT_CARD_SELECTOR = ".result-con"
+_RESULT_LINK_SELECTOR = "a[href]"
+_RESULT_TEAM_SELECTOR = ".team"
+_TEAM_NAME_SELECTOR = ".teamsBox .teamName"
+_MOBILE_TEAM_NAME_SELECTOR = ".teamsBoxDropdown .teamName"
+_MATCH_DATE_SELECTOR = ".timeAndEvent .date[data-unix]"
+_FALLBACK_DATE_SELECTOR = ".date[data-unix]"
+
 
 @dataclass(slots=True)
 class MatchMetadata:
@@ -37,13 +52,44 @@ class MatchMetadata:
         }
 
 
+@dataclass(slots=True)
+class _ResultCard:
+    """Details read from a match's card on the HLTV results listing."""
+
+    match_url: str
+    teams: List[str]
+    date: Optional[str]
+
+
 class MetadataCollector:
-    """Fetch metadata for HLTV demos and persist it to a JSON file."""
+    """Fetch metadata for HLTV demos and persist it to a JSON file.
 
-    def __init__(self, scraper: CloudScraper, metadata_path: Path, *, timeout: int = 60) -> None:
+    Entries are appended to a JSON Lines journal next to the metadata file as
+    downloads complete; :meth:`finalize` folds the journal into the JSON file. A
+    journal left behind by an interrupted run is folded in on construction.
+    """
+
+    def __init__(
+        self,
+        scraper: Union[CloudScraper, Http2Session],
+        metadata_path: Path,
+        *,
+        timeout: int = 60,
+    ) -> None:
         self.scraper = scraper
         self.metadata_path = Path(metadata_path)
+        # Suffix the full name so the journal can never collide with the metadata file itself.
+        self.journal_path = self.metadata_path.with_name(self.metadata_path.name + ".journal.jsonl")
         self.timeout = timeout
+        self._lock = threading.Lock()
+        # Recover entries journaled by an interrupted run so they are cached below.
+        self.finalize()
+        # Match details from earlier runs; these demos never need the HLTV pages again.
+        self._cached_match_info: Dict[str, object] = {
+            demo_id: entry["match_info"]
+            for demo_id, entry in self._load_metadata().get("demos", {}).items()
+            if isinstance(entry, dict) and entry.get("match_info")
+        }
 
     def record_download(
         self,
@@ -51,105 +97,136 @@ class MetadataCollector:
         *,
         file_path: Path,
         original_url: str,
-        response: Response,
+        resolved_url: Optional[str] = None,
     ) -> None:
         """Store metadata for a successfully downloaded demo."""
 
-        try:
-            match_metadata = self._collect_match_metadata(demo_id)
-        except RequestException as exc:
-            _LOGGER.warning("Failed to collect match metadata for %s: %s", demo_id, exc)
-            match_metadata = None
+        match_info = self._cached_match_info.get(str(demo_id))
+        if match_info is None:
+            try:
+                match_metadata = self._collect_match_metadata(demo_id)
+            except RequestException as exc:
+                _LOGGER.warning("Failed to collect match metadata for %s: %s", demo_id, exc)
+                match_metadata = None
+            match_info = match_metadata.as_dict() if match_metadata else None
+        else:
+            _LOGGER.debug("Reusing stored match metadata for demo %s", demo_id)
 
         entry: Dict[str, object] = {
             "filename": file_path.name,
-            "match_info": match_metadata.as_dict() if match_metadata else None,
+            "match_info": match_info,
             "download_date": datetime.now(tz=UTC).isoformat(),
             "file_size": file_path.stat().st_size,
             "original_url": original_url,
         }
 
-        if response.url:
-            entry["resolved_download_url"] = response.url
+        if resolved_url:
+            entry["resolved_download_url"] = resolved_url
+
+        line = _dumps_json({"demo_id": str(demo_id), "entry": entry})
+        # Downloads may complete concurrently; keep journal lines from interleaving.
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open("ab") as handle:
+                handle.write(line + b"\n")
+
+    def finalize(self) -> None:
+        """Merge journaled entries into the metadata JSON file and remove the journal."""
 
-        metadata = self._load_metadata()
-        metadata.setdefault("demos", {})[str(demo_id)] = entry
-        metadata["last_updated"] = datetime.now(tz=UTC).isoformat()
+        with self._lock:
+            if not self.journal_path.exists():
+                return
+            metadata = self._load_metadata()
+            demos = metadata.setdefault("demos", {})
+            with self.journal_path.open("rb") as handle:
+                for line_number, line in enumerate(handle, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = _loads_json(line)
+                        demos[record["demo_id"]] = record["entry"]
+                    except (ValueError, KeyError, TypeError) as exc:
+                        _LOGGER.warning(
+                            "Skipping malformed metadata journal line %s in %s: %s",
+                            line_number,
+                            self.journal_path,
+                            exc,
+                        )
+            metadata["last_updated"] = datetime.now(tz=UTC).isoformat()
 
-        self._write_metadata(metadata)
+            self._write_metadata(metadata)
+            self.journal_path.unlink()
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _collect_match_metadata(self, demo_id: int) -> Optional[MatchMetadata]:
-        match_url = self._locate_match_url(demo_id)
-        if not match_url:
+        result = self._locate_result(demo_id)
+        if result is None:
             return None
+        match_url, teams, date = result.match_url, result.teams, result.date
 
-        try:
-            soup = self._fetch_match_page(match_url)
-        except RequestException as exc:
-            _LOGGER.debug("Unable to fetch match page for demo %s: %s", demo_id, exc)
-            soup = None
-        teams: List[str] = []
-        date: Optional[str] = None
-        if soup is not None:
-            teams = self._extract_teams(soup)
-            date = self._extract_match_date(soup)
+        # The results listing usually carries everything; only fall back to the match page
+        # when it does not.
+        if not teams or date is None:
+            try:
+                tree = self._fetch_match_page(match_url)
+            except RequestException as exc:
+                _LOGGER.debug("Unable to fetch match page for demo %s: %s", demo_id, exc)
+                tree = None
+            if tree is not None:
+                teams = teams or self._extract_teams(tree)
+                date = date or self._extract_match_date(tree)
 
         match_id = self._parse_match_id(match_url)
         return MatchMetadata(match_id=match_id, match_url=match_url, teams=teams, date=date)
 
-    def _locate_match_url(self, demo_id: int) -> Optional[str]:
+    def _locate_result(self, demo_id: int) -> Optional[_ResultCard]:
         url = f"{_BASE_URL}/results?demoid={demo_id}"
         response = self.scraper.get(url, timeout=self.timeout)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        result_card = soup.select_one(".result-con a[href]")
-        if not result_card:
+        tree = LexborHTMLParser(response.text)
+        result_card = tree.css_first(_RESULT_CARD_SELECTOR)
+        link = result_card.css_first(_RESULT_LINK_SELECTOR) if result_card is not None else None
+        if link is None:
             _LOGGER.debug("No result card found for demo %s", demo_id)
             return None
-        href = result_card.get("href")
+        href = link.attributes.get("href")
         if not href:
             return None
-        return urljoin(_BASE_URL, href)
 
-    def _fetch_match_page(self, match_url: str) -> Optional[BeautifulSoup]:
+        date_elem = result_card.css_first(_FALLBACK_DATE_SELECTOR)
+        if date_elem is not None:
+            date = _unix_ms_to_date(date_elem.attributes.get("data-unix"))
+        else:
+            date = _unix_ms_to_date(result_card.attributes.get("data-zonedgrouping-entry-unix"))
+        return _ResultCard(
+            match_url=urljoin(_BASE_URL, href),
+            teams=_unique_texts(result_card.css(_RESULT_TEAM_SELECTOR)),
+            date=date,
+        )
+
+    def _fetch_match_page(self, match_url: str) -> Optional[LexborHTMLParser]:
         response = self.scraper.get(match_url, timeout=self.timeout)
         response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
-
-    def _extract_teams(self, soup: BeautifulSoup) -> List[str]:
-        teams: List[str] = []
-        for team_elem in soup.select(".teamsBox .teamName"):
-            name = team_elem.get_text(strip=True)
-            if not name or name in teams:
-                continue
-            teams.append(name)
+        return LexborHTMLParser(response.text)
+
+    def _extract_teams(self, tree: LexborHTMLParser) -> List[str]:
+        teams = _unique_texts(tree.css(_TEAM_NAME_SELECTOR))
         if teams:
             return teams
 
         # Fallback: try compact mobile layout
-        for team_elem in soup.select(".teamsBoxDropdown .teamName"):
-            name = team_elem.get_text(strip=True)
-            if not name or name in teams:
-                continue
-            teams.append(name)
-        return teams
-
-    def _extract_match_date(self, soup: BeautifulSoup) -> Optional[str]:
-        date_elem = soup.select_one(".timeAndEvent .date[data-unix]")
+        return _unique_texts(tree.css(_MOBILE_TEAM_NAME_SELECTOR))
+
+    def _extract_match_date(self, tree: LexborHTMLParser) -> Optional[str]:
+        date_elem = tree.css_first(_MATCH_DATE_SELECTOR)
+        if date_elem is None:
+            date_elem = tree.css_first(_FALLBACK_DATE_SELECTOR)
         if date_elem is None:
-            date_elem = soup.select_one(".date[data-unix]")
-        if not date_elem:
-            return None
-        try:
-            unix_ms = int(date_elem["data-unix"])
-        except (KeyError, ValueError):
             return None
-        dt = datetime.fromtimestamp(unix_ms / 1000, tz=UTC)
-        return dt.date().isoformat()
+        return _unix_ms_to_date(date_elem.attributes.get("data-unix"))
 
     @staticmethod
     def _parse_match_id(match_url: str) -> Optional[str]:
@@ -167,14 +244,47 @@ class MetadataCollector:
         if not self.metadata_path.exists():
             return {}
         try:
-            with self.metadata_path.open("r", encoding="utf-8") as handle:
-                return json.load(handle)
-        except json.JSONDecodeError as exc:
+            return _loads_json(self.metadata_path.read_bytes())
+        except ValueError as exc:
             _LOGGER.warning("Unable to parse metadata JSON at %s: %s", self.metadata_path, exc)
             return {}
 
     def _write_metadata(self, metadata: Dict[str, object]) -> None:
         self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.metadata_path.open("w", encoding="utf-8") as handle:
-            json.dump(metadata, handle, indent=2, ensure_ascii=False)
+        self.metadata_path.write_bytes(_dumps_json(metadata, indent=True))
+
+
+def _unique_texts(nodes: Iterable[LexborNode]) -> List[str]:
+    """Return the non-empty stripped text of ``nodes`` without duplicates, in order."""
+
+    texts: List[str] = []
+    seen: Set[str] = set()
+    for node in nodes:
+        text = node.text(strip=True)
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        texts.append(text)
+    return texts
+
+
+def _unix_ms_to_date(value: Optional[str]) -> Optional[str]:
+    try:
+        unix_ms = int(value)
+    except (TypeError, ValueError):
+        return None
+    dt = datetime.fromtimestamp(unix_ms / 1000, tz=UTC)
+    return dt.date().isoformat()
+
+
+def _dumps_json(obj: object, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _loads_json(data: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
@@ -0,0 +1,183 @@
+"""Optional ``io_uring`` write backend built on the ``liburing`` package (Linux only)."""
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set
+
+try:  # pragma: no cover - optional dependency
+    import liburing
+except ImportError:  # pragma: no cover - optional dependency
+    liburing = None
+
+_LOGGER = logging.getLogger(__name__)
+
+RING_ENTRIES = 256
+MAX_BATCH = 64
+# Bound the number of buffers each writer keeps alive for in-flight writes.
+MAX_IN_FLIGHT = 64
+
+
+def ensure_available() -> None:
+    """Raise ``RuntimeError`` when the io_uring backend cannot be used."""
+
+    if liburing is None:
+        raise RuntimeError("The io_uring backend requires liburing; install it with 'pip install liburing'.")
+
+
+@dataclass(slots=True)
+class UringOp:
+    """A single positional write queued on an :class:`IoUringBatchEngine`."""
+
+    fd: int
+    buf: bytes
+    offset: int
+    result: Optional[int] = None
+    error: Optional[BaseException] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def wait(self) -> int:
+        """Block until the write completes and return the number of bytes written."""
+
+        self.done.wait()
+        if self.error is not None:
+            raise OSError(f"io_uring submission failed: {self.error}") from self.error
+        assert self.result is not None
+        if self.result < 0:
+            raise OSError(-self.result, os.strerror(-self.result))
+        if self.result < len(self.buf):
+            raise OSError(f"Short write: {self.result} of {len(self.buf)} bytes")
+        return self.result
+
+
+class IoUringBatchEngine:
+    """Share one ring between every download thread.
+
+    Writers enqueue :class:`UringOp` instances; a daemon thread drains up to
+    ``max_batch`` of them, submits them with a single ``io_uring_enter`` and
+    signals each op as its completion arrives.
+    """
+
+    def __init__(self, *, entries: int = RING_ENTRIES, max_batch: int = MAX_BATCH) -> None:
+        ensure_available()
+        self.max_batch = min(max_batch, entries)
+        self._queue: "queue.Queue[Optional[UringOp]]" = queue.Queue()
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        # Completions are matched by a run-wide id: after a failed batch, its CQEs can still
+        # arrive while a later batch is being reaped.
+        self._op_ids = itertools.count()
+        self._in_flight: Dict[int, UringOp] = {}
+        try:
+            liburing.io_uring_queue_init(entries, self._ring)
+        except OSError as exc:
+            # Kernels or sandboxes can disable io_uring (kernel.io_uring_disabled, seccomp).
+            raise RuntimeError(f"io_uring is unavailable: {exc}") from exc
+        self._thread = threading.Thread(target=self._run, name="io-uring-engine", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: UringOp) -> UringOp:
+        self._queue.put(op)
+        return op
+
+    def close(self) -> None:
+        """Finish queued writes, stop the worker thread and release the ring."""
+
+        self._queue.put(None)
+        self._thread.join()
+        liburing.io_uring_queue_exit(self._ring)
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            op = self._queue.get()
+            if op is None:
+                break
+            batch: List[UringOp] = [op]
+            while len(batch) < self.max_batch:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    running = False
+                    break
+                batch.append(op)
+            self._process(batch)
+
+    def _process(self, batch: List[UringOp]) -> None:
+        pending: Set[int] = set()
+        try:
+            for op in batch:
+                op_id = next(self._op_ids)
+                sqe = liburing.io_uring_get_sqe(self._ring)
+                liburing.io_uring_prep_write(sqe, op.fd, op.buf, op.offset)
+                liburing.io_uring_sqe_set_data64(sqe, op_id)
+                self._in_flight[op_id] = op
+                pending.add(op_id)
+            liburing.io_uring_submit(self._ring)
+            while pending:
+                liburing.io_uring_wait_cqe(self._ring, self._cqe)
+                entry = self._cqe[0]
+                op_id = liburing.io_uring_cqe_get_data64(entry)
+                result = entry.res
+                liburing.io_uring_cqe_seen(self._ring, entry)
+                pending.discard(op_id)
+                # Ops from an earlier failed batch were already reported; only release them.
+                op = self._in_flight.pop(op_id, None)
+                if op is not None and not op.done.is_set():
+                    op.result = result
+                    op.done.set()
+        except Exception as exc:  # pragma: no cover - defensive, keeps waiters from hanging
+            _LOGGER.error("io_uring batch failed: %s", exc)
+            for op in batch:
+                if not op.done.is_set():
+                    op.error = exc
+                    op.done.set()
+
+
+class UringFileWriter:
+    """File-like sink that turns ``write`` calls into ops on a shared batch engine.
+
+    Writes are queued at increasing offsets without waiting; ``close`` blocks until
+    every queued write for the file has completed.
+    """
+
+    def __init__(self, engine: IoUringBatchEngine, fd: int) -> None:
+        self.engine = engine
+        self.fd = fd
+        self.offset = 0
+        self._pending: Deque[UringOp] = deque()
+
+    def write(self, data: bytes) -> int:
+        if not data:
+            return 0
+        op = self.engine.submit(UringOp(self.fd, bytes(data), self.offset))
+        self._pending.append(op)
+        self.offset += len(op.buf)
+        while len(self._pending) > MAX_IN_FLIGHT:
+            self._pending.popleft().wait()
+        return len(op.buf)
+
+    def close(self) -> None:
+        """Wait for every outstanding write, re-raising the first failure."""
+
+        error: Optional[OSError] = None
+        while self._pending:
+            try:
+                self._pending.popleft().wait()
+            except OSError as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "UringFileWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()